@@ -18,10 +18,29 @@ import sys
 import time
 import urllib.parse
 import urllib.request
-from typing import Dict, List, Sequence, Set, Tuple
+from pathlib import Path
+from typing import Dict, FrozenSet, List, Sequence, Set, Tuple
 
 from bs4 import BeautifulSoup, Comment, NavigableString
 
+from translate_io import BATCH_SEP, chunk_phrases, load_cache, save_cache, write_bytes_atomic
+
+try:
+    import orjson
+
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
+
+try:
+    import httpx
+except ImportError:
+    httpx = None
+
+# Source pages are only read, never re-serialized, so the faster C parser is
+# safe there. lxml is a required dependency of the translation scripts.
+SOURCE_PARSER_NAME = "lxml"
+
 
 def configure_stdout_utf8() -> None:
     """Best-effort UTF-8 stdout setup without import-time side effects."""
@@ -64,7 +83,8 @@ def to_google_lang(code: str) -> str:
 
 
 WORDS_RE = re.compile(r"\b[A-Za-z][A-Za-z'\-]{2,}\b")
-STOP_WORDS = {
+ASCII_LETTERS = bytes(range(ord("A"), ord("Z") + 1)) + bytes(range(ord("a"), ord("z") + 1))
+STOP_WORDS = frozenset({
     "the",
     "a",
     "an",
@@ -107,27 +127,41 @@ STOP_WORDS = {
     "study",
     "studies",
     "data",
-}
+})
 
 
 def is_english_source_text(text: str) -> bool:
     t = normalize(text)
     if len(t) < 4:
         return False
-    words = [w.lower() for w in WORDS_RE.findall(t)]
-    if not words:
-        return False
-    letters = sum(ch.isalpha() for ch in t)
-    ascii_letters = sum(("A" <= ch <= "Z") or ("a" <= ch <= "z") for ch in t)
+    # Multi-byte UTF-8 sequences never contain ASCII bytes, so deleting the
+    # ASCII letters from the encoded text counts them in C.
+    b = t.encode("utf-8")
+    ascii_letters = len(b) - len(b.translate(None, ASCII_LETTERS))
+    if t.isascii():
+        letters = ascii_letters
+    else:
+        letters = ascii_letters + sum(ch.isalpha() for ch in t if not ch.isascii())
     if letters == 0:
         return False
     if ascii_letters / letters < 0.92:
         return False
-    if len(words) == 1:
+    total = 0
+    hits = 0
+    first_len = 0
+    for m in WORDS_RE.finditer(t):
+        word = m.group()
+        total += 1
+        if word.lower() in STOP_WORDS:
+            hits += 1
+        if total >= 3 or (total == 2 and hits):
+            return True
+        if total == 1:
+            first_len = len(word)
+    if total == 1:
         # keep one-word terms like "Meta-Analysis", "Dashboard"
-        return len(words[0]) >= 4
-    hits = sum(1 for w in words if w in STOP_WORDS)
-    return hits >= 1 or len(words) >= 3
+        return first_len >= 4
+    return False
 
 
 def visible_text_nodes(soup: BeautifulSoup) -> List[NavigableString]:
@@ -141,46 +175,63 @@ def visible_text_nodes(soup: BeautifulSoup) -> List[NavigableString]:
     return nodes
 
 
+TRANSLATE_URL = "https://translate.googleapis.com/translate_a/single"
+_http_client = None
+
+
+def get_http_client():
+    """Shared keep-alive (HTTP/2 when ``h2`` is installed) client, or None without httpx."""
+    global _http_client
+    if _http_client is None and httpx is not None:
+        limits = httpx.Limits(max_connections=16, max_keepalive_connections=16)
+        try:
+            _http_client = httpx.Client(http2=True, timeout=25.0, limits=limits)
+        except ImportError:
+            _http_client = httpx.Client(timeout=25.0, limits=limits)
+    return _http_client
+
+
+def close_http_client() -> None:
+    global _http_client
+    if _http_client is not None:
+        _http_client.close()
+        _http_client = None
+
+
 def translate_google(text: str, lang: str) -> str:
-    params = urllib.parse.urlencode(
-        {"client": "gtx", "sl": "en", "tl": lang, "dt": "t", "q": text}
-    )
-    url = f"https://translate.googleapis.com/translate_a/single?{params}"
-    with urllib.request.urlopen(url, timeout=25) as resp:
-        payload = resp.read().decode("utf-8")
-    obj = json.loads(payload)
+    params = {"client": "gtx", "sl": "en", "tl": lang, "dt": "t", "q": text}
+    client = get_http_client()
+    if client is not None:
+        resp = client.get(TRANSLATE_URL, params=params)
+        resp.raise_for_status()
+        payload = resp.content
+    else:
+        url = f"{TRANSLATE_URL}?{urllib.parse.urlencode(params)}"
+        with urllib.request.urlopen(url, timeout=25) as resp:
+            payload = resp.read()
+    obj = _json_loads(payload)
     return "".join(part[0] for part in obj[0]).strip()
 
 
+_failed_translations: Set[Tuple[str, str]] = set()
+
+
 def batch_translate(texts: Sequence[str], lang: str, cache: Dict[Tuple[str, str], str]) -> Dict[str, str]:
     uniq = []
     seen = set()
     for t in texts:
         key = (lang, t)
-        if key in cache:
+        if key in cache or key in _failed_translations:
             continue
         if t not in seen:
             uniq.append(t)
             seen.add(t)
 
-    sep = "<<<SYNC_SEP_A12F>>>"
-    i = 0
-    while i < len(uniq):
-        chunk: List[str] = []
-        total = 0
-        while i < len(uniq):
-            nxt = uniq[i]
-            add_len = len(nxt) + (len(sep) if chunk else 0)
-            if chunk and (len(chunk) >= 40 or total + add_len > 3900):
-                break
-            chunk.append(nxt)
-            total += add_len
-            i += 1
-
-        joined = sep.join(chunk)
+    for chunk in chunk_phrases(uniq):
+        joined = BATCH_SEP.join(chunk)
         try:
             translated = translate_google(joined, lang)
-            parts = translated.split(sep)
+            parts = translated.split(BATCH_SEP)
             if len(parts) != len(chunk):
                 raise RuntimeError("separator mismatch")
             for src, tr in zip(chunk, parts):
@@ -191,10 +242,19 @@ def batch_translate(texts: Sequence[str], lang: str, cache: Dict[Tuple[str, str]
                     cache[(lang, src)] = translate_google(src, lang)
                     time.sleep(0.08)
                 except Exception:
-                    cache[(lang, src)] = src
+                    # Not cached: the cache is persisted and only holds real
+                    # results. The text stays as is and is not retried this run.
+                    _failed_translations.add((lang, src))
         time.sleep(0.06)
 
-    return {t: cache[(lang, t)] for t in texts}
+    return {t: cache.get((lang, t), t) for t in texts}
+
+
+def read_html(path: str) -> str:
+    return Path(path).read_bytes().decode("utf-8", "replace")
+
+
+_made_dirs: Set[str] = set()
 
 
 def backup_file(path: str, root: str, backup_base: str | None) -> str | None:
@@ -202,8 +262,16 @@ def backup_file(path: str, root: str, backup_base: str | None) -> str | None:
         return None
     rel = os.path.relpath(path, root)
     backup_path = os.path.join(backup_base, rel + ".bak")
-    os.makedirs(os.path.dirname(backup_path), exist_ok=True)
-    shutil.copy2(path, backup_path)
+    parent = os.path.dirname(backup_path)
+    if parent not in _made_dirs:
+        os.makedirs(parent, exist_ok=True)
+        _made_dirs.add(parent)
+    # The target is later swapped out with os.replace, so a hardlink keeps
+    # pointing at the pre-change content without copying any bytes.
+    try:
+        os.link(path, backup_path)
+    except OSError:
+        shutil.copy2(path, backup_path)
     return backup_path
 
 
@@ -217,6 +285,16 @@ def make_backup_run_dir(root: str, backup_dir: str, run_label: str) -> str:
     return run_dir
 
 
+def collect_source_texts(source_path: str) -> FrozenSet[str]:
+    source_soup = BeautifulSoup(read_html(source_path), SOURCE_PARSER_NAME)
+    texts = set()
+    for n in visible_text_nodes(source_soup):
+        s = normalize(str(n))
+        if is_english_source_text(s):
+            texts.add(s)
+    return frozenset(texts)
+
+
 def process_pair(
     root: str,
     source_fn: str,
@@ -225,22 +303,22 @@ def process_pair(
     cache: Dict[Tuple[str, str], str],
     dry_run: bool,
     backup_base: str | None,
+    source_texts_cache: Dict[str, FrozenSet[str]] | None = None,
 ) -> int:
     source_path = os.path.join(root, source_fn)
     target_path = os.path.join(root, target_fn)
 
-    with open(source_path, "r", encoding="utf-8", errors="replace") as f:
-        source_soup = BeautifulSoup(f.read(), "html.parser")
-    with open(target_path, "r", encoding="utf-8", errors="replace") as f:
-        target_soup = BeautifulSoup(f.read(), "html.parser")
-
-    source_texts: Set[str] = set()
-    for n in visible_text_nodes(source_soup):
-        s = normalize(str(n))
-        if is_english_source_text(s):
-            source_texts.add(s)
-
-    targets: List[Tuple[NavigableString, str, str, str]] = []
+    if source_texts_cache is not None and source_path in source_texts_cache:
+        source_texts = source_texts_cache[source_path]
+    else:
+        source_texts = collect_source_texts(source_path)
+        if source_texts_cache is not None:
+            source_texts_cache[source_path] = source_texts
+    if not source_texts:
+        return 0
+    target_soup = BeautifulSoup(read_html(target_path), "html.parser")
+
+    targets: List[Tuple[NavigableString, str, str, str, str]] = []
     for n in visible_text_nodes(target_soup):
         raw = str(n)
         stripped = normalize(raw)
@@ -252,24 +330,24 @@ def process_pair(
             continue
         leading = raw[: len(raw) - len(raw.lstrip())]
         trailing = raw[len(raw.rstrip()) :]
-        targets.append((n, stripped, leading, trailing))
+        targets.append((n, raw, stripped, leading, trailing))
+    if not targets:
+        return 0
 
-    unique = sorted({t[1] for t in targets}, key=len)
-    if unique:
-        batch_translate(unique, lang, cache)
+    unique = sorted({t[2] for t in targets}, key=len)
+    batch_translate(unique, lang, cache)
+    tr_map = {src: cache.get((lang, src), src) for src in unique}
 
     changes = 0
-    for node, src, leading, trailing in targets:
-        tr = cache.get((lang, src), src)
-        new = f"{leading}{tr}{trailing}"
-        if new != str(node):
+    for node, raw, src, leading, trailing in targets:
+        new = f"{leading}{tr_map[src]}{trailing}"
+        if new != raw:
             node.replace_with(NavigableString(new))
             changes += 1
 
     if changes and not dry_run:
         backup_path = backup_file(target_path, root, backup_base)
-        with open(target_path, "w", encoding="utf-8", newline="\n") as f:
-            f.write(str(target_soup))
+        write_bytes_atomic(target_path, str(target_soup).encode("utf-8"))
         if backup_path:
             print(f"[BAK] {os.path.relpath(backup_path, root)}")
 
@@ -292,6 +370,11 @@ def main() -> int:
         default="_translation_backups",
         help="Backup root folder (relative to --root, or absolute path). Empty string disables backups. Uses a unique per-run subfolder.",
     )
+    ap.add_argument(
+        "--cache-file",
+        default=".translate_cache.json",
+        help="Translation cache reused across runs (relative to --root, or absolute path). Empty string disables it.",
+    )
     args = ap.parse_args()
 
     root = os.path.abspath(args.root)
@@ -304,7 +387,10 @@ def main() -> int:
         print("Use codes like: fr, es, de, zh-cn")
         return 1
     lang = to_google_lang(lang_code)
-    cache: Dict[Tuple[str, str], str] = {}
+    cache_path: str | None = None
+    if (args.cache_file or "").strip():
+        cache_path = args.cache_file if os.path.isabs(args.cache_file) else os.path.join(root, args.cache_file)
+    cache = load_cache(cache_path)
     total = 0
     backup_base: str | None = None
     if not args.dry_run and (args.backup_dir or "").strip():
@@ -357,16 +443,21 @@ def main() -> int:
         print(f"\nPair validation errors: {pair_errors}")
         return 1
 
-    for src, tgt in pair_items:
-        print(f"[RUN] {src} -> {tgt}")
-        c = process_pair(root, src, tgt, lang, cache, args.dry_run, backup_base)
-        total += c
-        print(f"[OK] {tgt}: {c} replacements")
+    source_texts_cache: Dict[str, FrozenSet[str]] = {}
+    try:
+        for src, tgt in pair_items:
+            print(f"[RUN] {src} -> {tgt}")
+            c = process_pair(root, src, tgt, lang, cache, args.dry_run, backup_base, source_texts_cache)
+            total += c
+            print(f"[OK] {tgt}: {c} replacements")
+    finally:
+        close_http_client()
+        save_cache(cache_path, cache)
 
     print(f"\nTotal replacements: {total}")
     print(f"Cached phrases: {len(cache)}")
     if args.dry_run:
-        print("Dry run only. No files written.")
+        print("Dry run only. No HTML files written.")
     return 0
 
 
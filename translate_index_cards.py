@@ -11,19 +11,36 @@ Usage:
 from __future__ import annotations
 
 import argparse
+import http.client
 import io
 import json
 import os
+import random
 import re
 import shutil
 import sys
+import threading
 import time
+import urllib.error
 import urllib.parse
 import urllib.request
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from typing import Dict, List, Tuple
 
+import soupsieve
 from bs4 import BeautifulSoup
+from lxml import etree
+from lxml import html as lxml_html
+
+from translate_io import (
+    BATCH_SEP,
+    chunk_phrases,
+    load_cache,
+    save_cache,
+    write_bytes_atomic,
+    write_json_atomic,
+)
 
 
 def configure_stdout_utf8() -> None:
@@ -66,6 +83,41 @@ LANG_FILES = {
 }
 
 
+def has_class_xpath(name: str) -> str:
+    return f"contains(concat(' ', normalize-space(@class), ' '), ' {name} ')"
+
+
+WS_RE = re.compile(r"\s+")
+ASCII_WORD_RE = re.compile(r"[A-Za-z0-9]+")
+LABEL_RE = re.compile(r"[^A-Za-z0-9_.-]+")
+FETCH_WORKERS = 8
+CACHE_LOCK = threading.Lock()
+RETRY_ATTEMPTS = 6
+RETRY_BASE_SECONDS = 0.5
+RETRY_CAP_SECONDS = 8.0
+
+# index.html is only read, so its fixed card shape is extracted with
+# compiled XPath on an lxml tree; pages that get rewritten stay on BS4.
+SOURCE_PARSER = lxml_html.HTMLParser(encoding="utf-8")
+CARD_XPATH = etree.XPath(f"//a[{has_class_xpath('course-card')}]")
+CARD_TAG_XPATH = etree.XPath(
+    f".//*[{has_class_xpath('tag')}][ancestor::*[{has_class_xpath('card-top')}]]"
+)
+CARD_FIELD_XPATHS = {
+    name: etree.XPath(f"(.//*[{has_class_xpath(name)}])[1]")
+    for name in ("title", "desc", "meta")
+}
+PATH_STEP_XPATH = etree.XPath(f"//*[{has_class_xpath('path-step')}]")
+
+# Selectors for the localized pages, compiled once instead of per call.
+CARD_SELECTOR = soupsieve.compile("a.course-card")
+CARD_TAG_SELECTOR = soupsieve.compile(".card-top .tag")
+TITLE_SELECTOR = soupsieve.compile(".title")
+DESC_SELECTOR = soupsieve.compile(".desc")
+META_SELECTOR = soupsieve.compile(".meta")
+PATH_STEP_SELECTOR = soupsieve.compile(".path-step")
+
+
 def parse_args() -> argparse.Namespace:
     parser = argparse.ArgumentParser(description="Translate index card text still in English.")
     parser.add_argument(
@@ -76,7 +128,7 @@ def parse_args() -> argparse.Namespace:
     parser.add_argument(
         "--dry-run",
         action="store_true",
-        help="Compute and report changes without writing files.",
+        help="Compute and report changes without writing HTML files (the translation cache and state file are still updated).",
     )
     parser.add_argument(
         "--langs",
@@ -88,11 +140,27 @@ def parse_args() -> argparse.Namespace:
         default="_translation_backups",
         help="Backup root folder (relative to --root, or absolute path). Empty string disables backups. Uses a unique per-run subfolder.",
     )
+    parser.add_argument(
+        "--cache-file",
+        default=".translate_cache.json",
+        help="Translation cache reused across runs (relative to --root, or absolute path). Empty string disables it.",
+    )
+    parser.add_argument(
+        "--state-file",
+        default=".translate_index_state.json",
+        help="Records pages left clean by a run so unchanged ones are skipped next time (relative to --root, or absolute path). Empty string disables it.",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=8,
+        help="Number of index files processed concurrently.",
+    )
     return parser.parse_args()
 
 
 def normalize(text: str) -> str:
-    return re.sub(r"\s+", " ", text or "").strip()
+    return WS_RE.sub(" ", text or "").strip()
 
 
 def normalize_lang_code(code: str) -> str:
@@ -116,75 +184,310 @@ def backup_file(path: str, root: str, backup_base: str | None) -> str | None:
     return backup_path
 
 
+def load_state(state_path: str | None, source_sig: List[int]) -> Dict[str, List[int]]:
+    """Return ``{filename: [mtime_ns, size]}`` of pages that were clean for this index.html."""
+    if not state_path or not os.path.exists(state_path):
+        return {}
+    try:
+        with open(state_path, "r", encoding="utf-8") as f:
+            stored = json.load(f)
+    except (OSError, ValueError) as exc:
+        print(f"[WARN] Ignoring unreadable state file {state_path}: {exc}")
+        return {}
+    if not isinstance(stored, dict) or stored.get("source") != source_sig:
+        return {}
+    files = stored.get("files")
+    return dict(files) if isinstance(files, dict) else {}
+
+
+def save_state(state_path: str | None, source_sig: List[int], files: Dict[str, List[int]]) -> None:
+    if not state_path:
+        return
+    write_json_atomic(state_path, {"source": source_sig, "files": files})
+
+
+def file_sig(path: str) -> List[int]:
+    st = os.stat(path)
+    return [st.st_mtime_ns, st.st_size]
+
+
 def make_backup_run_dir(root: str, backup_dir: str, run_label: str) -> str:
     base_root = backup_dir if os.path.isabs(backup_dir) else os.path.join(root, backup_dir)
     stamp = time.strftime("%Y%m%d_%H%M%S")
-    safe_label = re.sub(r"[^A-Za-z0-9_.-]+", "-", run_label).strip("-") or "run"
+    safe_label = LABEL_RE.sub("-", run_label).strip("-") or "run"
     nonce = f"{time.time_ns() % 1_000_000_000:09d}"
     run_dir = os.path.join(base_root, f"{stamp}_{safe_label}_{os.getpid()}_{nonce}")
     os.makedirs(run_dir, exist_ok=True)
     return run_dir
 
 
+def element_text(el) -> str:
+    return normalize(" ".join(el.itertext()))
+
+
 def get_source_cards(root: str) -> Tuple[Dict[str, CardSource], List[str]]:
     source_path = os.path.join(root, "index.html")
-    with open(source_path, "r", encoding="utf-8", errors="replace") as fh:
-        soup = BeautifulSoup(fh.read(), "html.parser")
+    with open(source_path, "rb") as fh:
+        doc = lxml_html.document_fromstring(fh.read(), parser=SOURCE_PARSER)
 
     cards: Dict[str, CardSource] = {}
-    for card in soup.select("a.course-card"):
+    for card in CARD_XPATH(doc):
         href = (card.get("href") or "").strip()
         if not href:
             continue
-        title_el = card.select_one(".title")
-        desc_el = card.select_one(".desc")
-        meta_el = card.select_one(".meta")
+        fields: Dict[str, str] = {}
+        for name, xpath in CARD_FIELD_XPATHS.items():
+            found = xpath(card)
+            fields[name] = element_text(found[0]) if found else ""
         cards[href] = CardSource(
-            tags=[normalize(t.get_text(" ", strip=True)) for t in card.select(".card-top .tag")],
-            title=normalize(title_el.get_text(" ", strip=True) if title_el else ""),
-            desc=normalize(desc_el.get_text(" ", strip=True) if desc_el else ""),
-            meta=normalize(meta_el.get_text(" ", strip=True) if meta_el else ""),
+            tags=[element_text(t) for t in CARD_TAG_XPATH(card)],
+            title=fields["title"],
+            desc=fields["desc"],
+            meta=fields["meta"],
         )
 
-    path_steps = [normalize(a.get_text(" ", strip=True)) for a in soup.select(".path-step")]
+    path_steps = [element_text(step) for step in PATH_STEP_XPATH(doc)]
     return cards, path_steps
 
 
-def translate_google(text: str, lang: str, cache: Dict[Tuple[str, str], str]) -> str:
-    text = normalize(text)
-    if not text:
-        return text
-    key = (lang, text)
-    if key in cache:
-        return cache[key]
+class RateLimiter:
+    """Token bucket shared by all fetch threads, with a global pause on 429s."""
+
+    def __init__(self, rate: float = 10, per: float = 1.0) -> None:
+        self.rate = rate
+        self.per = per
+        self.tokens = float(rate)
+        self.updated = time.monotonic()
+        self.blocked_until = 0.0
+        self.lock = threading.Lock()
+
+    def acquire(self) -> None:
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                if now < self.blocked_until:
+                    wait = self.blocked_until - now
+                else:
+                    elapsed = now - self.updated
+                    self.tokens = min(float(self.rate), self.tokens + elapsed * self.rate / self.per)
+                    self.updated = now
+                    if self.tokens >= 1:
+                        self.tokens -= 1
+                        return
+                    wait = (1 - self.tokens) * self.per / self.rate
+            time.sleep(wait)
+
+    def penalize(self, seconds: float) -> None:
+        with self.lock:
+            self.blocked_until = max(self.blocked_until, time.monotonic() + seconds)
+            # Refill from the end of the pause so it is not followed by a burst.
+            self.tokens = 0.0
+            self.updated = self.blocked_until
+
+
+RATE_LIMITER = RateLimiter(rate=10, per=1.0)
+
+
+def backoff_delay(attempt: int) -> float:
+    """Capped exponential backoff with full jitter."""
+    return random.uniform(0, min(RETRY_CAP_SECONDS, RETRY_BASE_SECONDS * (2 ** attempt)))
+
+
+def parse_retry_after(value: str | None) -> float | None:
+    if not value:
+        return None
+    try:
+        return min(max(float(value), 0.0), 60.0)
+    except ValueError:
+        return None
+
+
+TRANSLATE_HOST = "translate.googleapis.com"
+_idle_conns: List[http.client.HTTPSConnection] = []
+_conns_lock = threading.Lock()
+
+
+def uses_proxy() -> bool:
+    """True when urllib would route translate requests through an HTTPS proxy."""
+    return bool(urllib.request.getproxies().get("https")) and not urllib.request.proxy_bypass(TRANSLATE_HOST)
+
+
+def urlopen_get(path: str) -> Tuple[int, str | None, bytes]:
+    """GET through urllib, which handles proxies, proxy auth and redirects."""
+    try:
+        with urllib.request.urlopen(f"https://{TRANSLATE_HOST}{path}", timeout=25) as resp:
+            return resp.status, resp.headers.get("Retry-After"), resp.read()
+    except urllib.error.HTTPError as exc:
+        return exc.code, exc.headers.get("Retry-After"), b""
+
+
+def http_get(path: str) -> Tuple[int, str | None, bytes]:
+    """GET over a pooled keep-alive connection; returns (status, Retry-After, body).
+
+    The raw connection pool knows nothing about proxies, so behind one
+    (HTTPS_PROXY and friends) requests go through urlopen instead.
+    """
+    if uses_proxy():
+        return urlopen_get(path)
+    while True:
+        with _conns_lock:
+            conn = _idle_conns.pop() if _idle_conns else None
+        reused = conn is not None
+        if conn is None:
+            conn = http.client.HTTPSConnection(TRANSLATE_HOST, timeout=25)
+        try:
+            conn.request("GET", path)
+            resp = conn.getresponse()
+            body = resp.read()
+        except (http.client.BadStatusLine, ConnectionError):
+            conn.close()
+            if reused:
+                # The server dropped an idle keep-alive connection; retry on
+                # another one without spending a retry attempt.
+                continue
+            raise
+        except Exception:  # noqa: BLE001
+            conn.close()
+            raise
+        if resp.will_close:
+            conn.close()
+        else:
+            with _conns_lock:
+                _idle_conns.append(conn)
+        return resp.status, resp.getheader("Retry-After"), body
+
+
+def close_connections() -> None:
+    with _conns_lock:
+        while _idle_conns:
+            _idle_conns.pop().close()
 
+
+def fetch_translation(text: str, lang: str) -> str:
     params = urllib.parse.urlencode(
         {"client": "gtx", "sl": "en", "tl": lang, "dt": "t", "q": text}
     )
-    url = f"https://translate.googleapis.com/translate_a/single?{params}"
+    path = f"/translate_a/single?{params}"
 
     last_err = None
-    for attempt in range(4):
+    for attempt in range(RETRY_ATTEMPTS):
+        throttled = False
+        RATE_LIMITER.acquire()
         try:
-            with urllib.request.urlopen(url, timeout=25) as resp:
-                payload = resp.read().decode("utf-8")
-            obj = json.loads(payload)
+            status, retry_after_header, payload = http_get(path)
+            if status in (429, 503):
+                # Pause every fetch thread, not just this one; the next
+                # acquire() waits out the penalty.
+                retry_after = parse_retry_after(retry_after_header)
+                RATE_LIMITER.penalize(retry_after if retry_after is not None else backoff_delay(attempt))
+                throttled = True
+                raise RuntimeError(f"HTTP {status}")
+            if 300 <= status < 400:
+                # Only urlopen follows redirects; a pooled request retries.
+                raise RuntimeError(f"HTTP {status} redirect")
+            if status != 200:
+                raise RuntimeError(f"HTTP {status}")
+            obj = json.loads(payload.decode("utf-8"))
             translated = "".join(part[0] for part in obj[0]).strip()
             if translated:
-                cache[key] = translated
                 return translated
         except Exception as exc:  # noqa: BLE001
             last_err = exc
-            time.sleep(0.4 * (attempt + 1))
+        if not throttled and attempt + 1 < RETRY_ATTEMPTS:
+            time.sleep(backoff_delay(attempt))
 
     raise RuntimeError(f"Translation failed for lang={lang}, text={text!r}: {last_err}")
 
 
+def translate_google(text: str, lang: str, cache: Dict[Tuple[str, str], str]) -> str:
+    text = normalize(text)
+    if not text:
+        return text
+    key = (lang, text)
+    if key in cache:
+        return cache[key]
+    translated = fetch_translation(text, lang)
+    with CACHE_LOCK:
+        cache[key] = translated
+    return translated
+
+
+def translate_chunk(chunk: List[str], lang: str) -> List[str] | None:
+    """Translate one separator-joined chunk; None when the split does not line up."""
+    try:
+        parts = fetch_translation(BATCH_SEP.join(chunk), lang).split(BATCH_SEP)
+    except Exception:  # noqa: BLE001
+        return None
+    parts = [part.strip() for part in parts]
+    if len(parts) != len(chunk) or not all(parts):
+        return None
+    return parts
+
+
+def translate_google_batch(texts: List[str], lang: str, cache: Dict[Tuple[str, str], str]) -> None:
+    """Fill cache for all texts using separator-joined requests of up to 40 phrases."""
+    uniq: List[str] = []
+    seen = set()
+    for text in texts:
+        text = normalize(text)
+        if not text or (lang, text) in cache or text in seen:
+            continue
+        uniq.append(text)
+        seen.add(text)
+
+    chunks = chunk_phrases(uniq)
+    if not chunks:
+        return
+
+    # Chunks are independent requests, so overlap their network latency.
+    with ThreadPoolExecutor(max_workers=min(FETCH_WORKERS, len(chunks))) as pool:
+        results = list(pool.map(lambda c: translate_chunk(c, lang), chunks))
+
+    for chunk, parts in zip(chunks, results):
+        if parts is None:
+            for src in chunk:
+                translate_google(src, lang, cache)
+            continue
+        with CACHE_LOCK:
+            for src, tr in zip(chunk, parts):
+                cache[(lang, src)] = tr
+
+
 def set_plain_text(el, value: str) -> None:
     el.clear()
     el.append(value)
 
 
+def english_needles(
+    source_cards: Dict[str, CardSource], source_steps: List[str]
+) -> List[Tuple[bytes, ...]] | None:
+    """ASCII word sets a page must contain before any source phrase can match.
+
+    Every word of a normalized phrase sits inside a single text node, so a
+    page lacking any one of a phrase's words cannot show that phrase. Returns
+    None when some phrase has no ASCII word and so cannot be ruled out.
+    """
+    phrases = set(source_steps)
+    for card in source_cards.values():
+        phrases.update(card.tags)
+        phrases.update((card.title, card.desc, card.meta))
+    phrases.discard("")
+
+    needles = set()
+    for phrase in phrases:
+        words = ASCII_WORD_RE.findall(phrase)
+        if not words:
+            return None
+        needles.add(tuple(sorted({w.encode("ascii") for w in words}, key=len, reverse=True)))
+    return sorted(needles)
+
+
+def may_contain_english(data: bytes, needles: List[Tuple[bytes, ...]] | None) -> bool:
+    if needles is None:
+        return True
+    return any(all(word in data for word in words) for words in needles)
+
+
 def translate_file(
     file_path: str,
     root: str,
@@ -194,64 +497,82 @@ def translate_file(
     source_steps: List[str],
     cache: Dict[Tuple[str, str], str],
     dry_run: bool = False,
+    needles: List[Tuple[bytes, ...]] | None = None,
 ) -> int:
-    with open(file_path, "r", encoding="utf-8", errors="replace") as fh:
+    with open(file_path, "rb") as fh:
         html = fh.read()
 
-    soup = BeautifulSoup(html, "html.parser")
-    changes = 0
+    # Cheap byte scan first: a fully localized page skips parsing entirely.
+    if not may_contain_english(html, needles):
+        return 0
+
+    # Rewritten pages use html.parser, like sync_translate_from_source.py,
+    # so serialization does not churn markup (lxml drops the blank line
+    # after the doctype, for one).
+    soup = BeautifulSoup(html, "html.parser", from_encoding="utf-8")
 
+    # Group every element still showing its English source text by that
+    # text, so each distinct phrase is translated once in a few batched
+    # requests.
+    card_by_href: Dict[str, object] = {}
+    for card in CARD_SELECTOR.select(soup):
+        card_by_href.setdefault(card.get("href") or "", card)
+
+    pending: Dict[str, List[object]] = {}
     for href, src in source_cards.items():
-        card = soup.select_one(f'a.course-card[href="{href}"]')
+        card = card_by_href.get(href)
         if not card:
             continue
 
-        tags = card.select(".card-top .tag")
+        tags = CARD_TAG_SELECTOR.select(card)
         for idx, tag_el in enumerate(tags):
             if idx >= len(src.tags):
                 continue
             current = normalize(tag_el.get_text(" ", strip=True))
-            if current == src.tags[idx]:
-                translated = translate_google(src.tags[idx], lang, cache)
-                if translated != current:
-                    set_plain_text(tag_el, translated)
-                    changes += 1
+            if current and current == src.tags[idx]:
+                pending.setdefault(current, []).append(tag_el)
 
         for sel, src_text in (
-            (".title", src.title),
-            (".desc", src.desc),
-            (".meta", src.meta),
+            (TITLE_SELECTOR, src.title),
+            (DESC_SELECTOR, src.desc),
+            (META_SELECTOR, src.meta),
         ):
             if not src_text:
                 continue
-            el = card.select_one(sel)
+            el = sel.select_one(card)
             if not el:
                 continue
             if el.find(attrs={"lang": True}):
                 continue
             current = normalize(el.get_text(" ", strip=True))
             if current == src_text:
-                translated = translate_google(src_text, lang, cache)
-                if translated != current:
-                    set_plain_text(el, translated)
-                    changes += 1
+                pending.setdefault(src_text, []).append(el)
 
-    steps = soup.select(".path-step")
+    steps = PATH_STEP_SELECTOR.select(soup)
     for idx, step_el in enumerate(steps):
         if idx >= len(source_steps):
             break
         src_step = source_steps[idx]
         current = normalize(step_el.get_text(" ", strip=True))
-        if current == src_step:
-            translated = translate_google(src_step, lang, cache)
-            if translated != current:
-                set_plain_text(step_el, translated)
-                changes += 1
+        if current and current == src_step:
+            pending.setdefault(src_step, []).append(step_el)
+
+    translate_google_batch(list(pending), lang, cache)
+
+    changes = 0
+    for src_text, elements in pending.items():
+        translated = cache[(lang, src_text)]
+        if translated == src_text:
+            continue
+        for el in elements:
+            set_plain_text(el, translated)
+        changes += len(elements)
 
     if changes > 0 and not dry_run:
         backup_path = backup_file(file_path, root, backup_base)
-        with open(file_path, "w", encoding="utf-8", newline="\n") as fh:
-            fh.write(str(soup))
+        # Renamed over the page, so a crash or a concurrent run never leaves
+        # a half-written index page.
+        write_bytes_atomic(file_path, soup.encode("utf-8", formatter="minimal"))
         if backup_path:
             print(f"[BAK] {os.path.relpath(backup_path, root)}")
 
@@ -265,13 +586,26 @@ def main() -> int:
     if not os.path.isdir(root):
         print(f"[ERR] Root directory not found: {root}")
         return 1
+    # One directory listing instead of an exists() call per page.
+    with os.scandir(root) as entries:
+        present = {entry.name for entry in entries if entry.is_file()}
     source_path = os.path.join(root, "index.html")
-    if not os.path.exists(source_path):
+    if "index.html" not in present:
         print(f"[ERR] Required source file not found: {source_path}")
         return 1
 
     source_cards, source_steps = get_source_cards(root)
-    cache: Dict[Tuple[str, str], str] = {}
+    needles = english_needles(source_cards, source_steps)
+    cache_path: str | None = None
+    if (args.cache_file or "").strip():
+        cache_path = args.cache_file if os.path.isabs(args.cache_file) else os.path.join(root, args.cache_file)
+    cache = load_cache(cache_path)
+    cached_before = len(cache)
+    state_path: str | None = None
+    if (args.state_file or "").strip():
+        state_path = args.state_file if os.path.isabs(args.state_file) else os.path.join(root, args.state_file)
+    source_sig = file_sig(source_path)
+    clean_files = load_state(state_path, source_sig)
 
     total_changes = 0
     per_file: Dict[str, int] = {}
@@ -300,7 +634,7 @@ def main() -> int:
         print(f"[ERR] Unsupported language code for index translation: {code}")
     selected_filenames = [LANG_FILES[code] for code in selected if code in LANG_FILES]
     missing_selected = sorted(
-        filename for filename in selected_filenames if not os.path.exists(os.path.join(root, filename))
+        filename for filename in selected_filenames if filename not in present
     )
     for filename in missing_selected:
         selection_errors += 1
@@ -309,44 +643,81 @@ def main() -> int:
         print("[ERR] Aborting before processing due to selection errors.")
         return 1
 
+    jobs: List[Tuple[str, str, str, bool]] = []
     for lang_code, filename in LANG_FILES.items():
         if selected and lang_code not in selected:
             continue
-        lang = to_google_lang(lang_code)
-        path = os.path.join(root, filename)
-        if not os.path.exists(path):
+        if filename not in present:
             print(f"[SKIP] {filename} not found")
             continue
-        processed_files += 1
-        print(f"[RUN] {filename} ({lang}) ...", flush=True)
-        try:
-            changes = translate_file(
-                file_path=path,
-                root=root,
-                backup_base=backup_base,
-                lang=lang,
-                source_cards=source_cards,
-                source_steps=source_steps,
-                cache=cache,
-                dry_run=args.dry_run,
-            )
-            per_file[filename] = changes
-            total_changes += changes
-            print(f"[OK] {filename}: {changes} replacements")
-        except Exception as exc:  # noqa: BLE001
-            print(f"[ERR] {filename}: {exc}")
-            return 1
+        path = os.path.join(root, filename)
+        # A page left clean by an earlier run against the same index.html,
+        # and not touched since, cannot have anything left to replace.
+        unchanged = filename in clean_files and clean_files[filename] == file_sig(path)
+        jobs.append((filename, to_google_lang(lang_code), path, unchanged))
+
+    try:
+        # Files are independent, so parsing and network waits overlap across
+        # workers; results are still reported in LANG_FILES order.
+        with ThreadPoolExecutor(max_workers=max(1, args.workers)) as pool:
+            futures = []
+            for filename, lang, path, unchanged in jobs:
+                if unchanged:
+                    futures.append(None)
+                    continue
+                print(f"[RUN] {filename} ({lang}) ...", flush=True)
+                futures.append(
+                    pool.submit(
+                        translate_file,
+                        file_path=path,
+                        root=root,
+                        backup_base=backup_base,
+                        lang=lang,
+                        source_cards=source_cards,
+                        source_steps=source_steps,
+                        cache=cache,
+                        dry_run=args.dry_run,
+                        needles=needles,
+                    )
+                )
+            for (filename, _, path, _), future in zip(jobs, futures):
+                processed_files += 1
+                if future is None:
+                    per_file[filename] = 0
+                    print(f"[OK] {filename}: 0 replacements (unchanged since last clean run)")
+                    continue
+                try:
+                    changes = future.result()
+                    per_file[filename] = changes
+                    total_changes += changes
+                    print(f"[OK] {filename}: {changes} replacements")
+                except Exception as exc:  # noqa: BLE001
+                    print(f"[ERR] {filename}: {exc}")
+                    for pending in futures:
+                        if pending is not None:
+                            pending.cancel()
+                    return 1
+                # Written pages are clean too: every replaced element now
+                # differs from its English source.
+                if changes == 0 or not args.dry_run:
+                    clean_files[filename] = file_sig(path)
+                else:
+                    clean_files.pop(filename, None)
+    finally:
+        close_connections()
+        save_cache(cache_path, cache)
+        save_state(state_path, source_sig, clean_files)
 
     if selected and processed_files == 0:
         selection_errors += 1
         print("[ERR] no index files matched the provided --langs filter")
 
     print(f"\nTotal replacements: {total_changes}")
-    print(f"Unique translated phrases cached: {len(cache)}")
+    print(f"Unique translated phrases cached: {len(cache)} ({len(cache) - cached_before} new)")
     if selection_errors:
         print(f"Selection errors: {selection_errors}")
     if args.dry_run:
-        print("Dry run only. No files written.")
+        print("Dry run only. No HTML files written.")
     return 1 if selection_errors else 0
 
 
@@ -0,0 +1,111 @@
+"""File helpers shared by the translation scripts.
+
+Atomic writes plus the on-disk translation cache that
+sync_translate_from_source.py and translate_index_cards.py both use.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import tempfile
+from typing import Dict, List, Sequence, Tuple
+
+# Read once at import, before any worker threads exist: os.umask() can only
+# be queried by setting it.
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+
+# Joins phrases into one translate request; the translator leaves it intact
+# so the response can be split back into per-phrase results.
+BATCH_SEP = "<<<SYNC_SEP_A12F>>>"
+
+
+def chunk_phrases(phrases: Sequence[str], max_items: int = 40, max_chars: int = 3900) -> List[List[str]]:
+    """Split phrases into chunks whose BATCH_SEP-joined length fits one request."""
+    chunks: List[List[str]] = []
+    chunk: List[str] = []
+    total = 0
+    for phrase in phrases:
+        add_len = len(phrase) + (len(BATCH_SEP) if chunk else 0)
+        if chunk and (len(chunk) >= max_items or total + add_len > max_chars):
+            chunks.append(chunk)
+            chunk = []
+            total = 0
+            add_len = len(phrase)
+        chunk.append(phrase)
+        total += add_len
+    if chunk:
+        chunks.append(chunk)
+    return chunks
+
+
+def write_bytes_atomic(path: str, data: bytes) -> None:
+    """Write data to a unique temp file beside path, then rename it over path.
+
+    The result keeps the existing file's mode, or gets the usual umask default
+    for a new file, rather than mkstemp's 0600.
+    """
+    parent = os.path.dirname(path) or "."
+    os.makedirs(parent, exist_ok=True)
+    try:
+        mode = os.stat(path).st_mode & 0o7777
+    except FileNotFoundError:
+        mode = 0o666 & ~_UMASK
+    fd, tmp_path = tempfile.mkstemp(prefix=os.path.basename(path) + ".", suffix=".tmp", dir=parent)
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.chmod(tmp_path, mode)
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+def write_json_atomic(path: str, obj: object) -> None:
+    write_bytes_atomic(path, json.dumps(obj, ensure_ascii=False, sort_keys=True).encode("utf-8"))
+
+
+def load_cache(cache_path: str | None) -> Dict[Tuple[str, str], str]:
+    """Load a persisted ``{lang: {source: translation}}`` cache, if present."""
+    if not cache_path or not os.path.exists(cache_path):
+        return {}
+    try:
+        with open(cache_path, "r", encoding="utf-8") as f:
+            stored = json.load(f)
+    except (OSError, ValueError) as exc:
+        print(f"[WARN] Ignoring unreadable cache file {cache_path}: {exc}")
+        return {}
+    if not isinstance(stored, dict):
+        print(f"[WARN] Ignoring cache file {cache_path}: expected a JSON object")
+        return {}
+    cache: Dict[Tuple[str, str], str] = {}
+    for lang, entries in stored.items():
+        if not isinstance(entries, dict):
+            continue
+        for src, tr in entries.items():
+            if isinstance(tr, str):
+                cache[(lang, src)] = tr
+    return cache
+
+
+def save_cache(cache_path: str | None, cache: Dict[Tuple[str, str], str]) -> None:
+    """Atomically persist the cache, merged over whatever another script saved meanwhile.
+
+    Every entry is a real translator result, including phrases that come back
+    unchanged (e.g. "4. GRADE"), so a rerun does not fetch them again. Callers
+    must not cache fallbacks for failed requests.
+    """
+    if not cache_path:
+        return
+    merged = load_cache(cache_path)
+    merged.update(cache)
+    stored: Dict[str, Dict[str, str]] = {}
+    for (lang, src), tr in merged.items():
+        if tr:
+            stored.setdefault(lang, {})[src] = tr
+    write_json_atomic(cache_path, stored)
@@ -1,5 +1,6 @@
 """Verify all review fixes were applied correctly."""
-import io, os, sys, glob, re
+import io, os, sys, glob
+from concurrent.futures import ThreadPoolExecutor
 try:
     sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding="utf-8", errors="replace")
 except Exception:
@@ -8,53 +9,80 @@ except Exception:
 os.chdir(os.path.dirname(os.path.abspath(__file__)))
 ar_files = sorted(f for f in os.listdir(".") if f.endswith("-ar.html"))
 
+ZWSP = "\u200b".encode("utf-8")
+ARABIC_CARD = "\u0628\u0637\u0627\u0642\u0629".encode("utf-8")  # بطاقة
+
+
+def scan(fn):
+    """Read one Arabic page once and collect everything the HTML checks need."""
+    with open(fn, "rb") as f:
+        data = f.read()
+    # 500 characters never take more than 2000 UTF-8 bytes.
+    head = data[:2000].decode("utf-8", "replace")[:500]
+    return {
+        "lang_dir_ok": 'lang="ar"' in head and 'dir="rtl"' in head,
+        "good_selector": b".course-card:not(.card-hidden)" in data,
+        "arabic_selector": ARABIC_CARD in data,
+        "zwsp": data.count(ZWSP),
+        "wrong_link": b'href="index.html"' in data,
+        "correct_en": data.count(b'"Correct!'),
+        "yes_labels": data.count(b">YES<"),
+        "no_labels": data.count(b">NO<"),
+    }
+
+
+# Fixed needles searched in the Python scripts (CHECKs 5-8); every script is
+# read once and tested against the whole table.
+PY_NEEDLES = {
+    "errors_ignore": ('errors="igno' + 're"').encode("ascii"),
+    "wildcard_import": b"from selenium.common.exceptions import *",
+    "navigable_string": b"NavigableString(",
+    "replace_with": b"replace_with",
+    "hardcoded_path": rb"C:\Users",
+}
+
+
+def scan_py(py):
+    with open(py, "rb") as f:
+        data = f.read()
+    return {name: needle in data for name, needle in PY_NEEDLES.items()}
+
+
+py_files = sorted(glob.glob("*.py"))
+# The scans are independent file reads, so overlap them on a thread pool.
+with ThreadPoolExecutor(max_workers=min(32, (os.cpu_count() or 1) * 4)) as ex:
+    scans = dict(zip(ar_files, ex.map(scan, ar_files)))
+    py_scans = dict(zip(py_files, ex.map(scan_py, py_files)))
+
 print("=== CHECK 1: lang/dir attributes ===")
 correct = 0
 for fn in ar_files:
-    with open(fn, "r", encoding="utf-8", errors="replace") as f:
-        head = f.read(500)
-    if 'lang="ar"' in head and 'dir="rtl"' in head:
+    if scans[fn]["lang_dir_ok"]:
         correct += 1
     else:
         print(f"  WRONG: {fn}")
 print(f"  Correct: {correct}/{len(ar_files)}")
 
 print("\n=== CHECK 2: CSS selector in index-ar.html ===")
-with open("index-ar.html", "r", encoding="utf-8") as f:
-    idx = f.read()
-good = ".course-card:not(.card-hidden)" in idx
-bad = "\u0628\u0637\u0627\u0642\u0629" in idx  # بطاقة
+idx = scans["index-ar.html"]
+good = idx["good_selector"]
+bad = idx["arabic_selector"]
 print(f"  Correct selector: {'YES' if good else 'NO'}")
 print(f"  Arabic selector gone: {'YES' if not bad else 'NO'}")
 
 print("\n=== CHECK 3: Zero-width spaces (U+200B) ===")
-total_zwsp = 0
-for fn in ar_files:
-    with open(fn, "r", encoding="utf-8") as f:
-        total_zwsp += f.read().count("\u200b")
+total_zwsp = sum(scans[fn]["zwsp"] for fn in ar_files)
 print(f"  Total remaining: {total_zwsp}")
 
 print("\n=== CHECK 4: Course Library links ===")
-wrong_links = []
-for fn in ar_files:
-    if fn == "index-ar.html":
-        continue
-    with open(fn, "r", encoding="utf-8") as f:
-        content = f.read()
-    if 'href="index.html"' in content:
-        wrong_links.append(fn)
+wrong_links = [fn for fn in ar_files if fn != "index-ar.html" and scans[fn]["wrong_link"]]
 print(f"  Files still pointing to index.html: {len(wrong_links)}")
 if wrong_links:
     for f in wrong_links[:5]:
         print(f"    - {f}")
 
 print("\n=== CHECK 5: errors='ignore' in Python scripts ===")
-has_ignore = []
-_bad_pattern = 'errors="igno' + 're"'
-for py in sorted(glob.glob("*.py")):
-    with open(py, "r", encoding="utf-8") as f:
-        if _bad_pattern in f.read():
-            has_ignore.append(py)
+has_ignore = [py for py in py_files if py_scans[py]["errors_ignore"]]
 if has_ignore:
     for f in has_ignore:
         print(f"  STILL HAS: {f}")
@@ -62,9 +90,7 @@ else:
     print("  All fixed (0 files with errors='ignore')")
 
 print("\n=== CHECK 6: Wildcard import in test script ===")
-with open("test_methods_course.py", "r", encoding="utf-8") as f:
-    tc = f.read()
-if "from selenium.common.exceptions import *" in tc:
+if py_scans["test_methods_course.py"]["wildcard_import"]:
     print("  STILL HAS wildcard import")
 else:
     print("  Fixed (explicit imports)")
@@ -72,16 +98,12 @@ else:
 print("\n=== CHECK 7: NavigableString in replace_with ===")
 for py in ["complete_arabic_translations.py", "complete_existing_course_translations.py",
            "batch_translate_visible_nodes.py", "sync_translate_from_source.py"]:
-    with open(py, "r", encoding="utf-8") as f:
-        content = f.read()
-    has_safe = "NavigableString(" in content and "replace_with" in content
-    has_unsafe = re.search(r"replace_with\([^N]", content)
+    result = py_scans[py]
+    has_safe = result["navigable_string"] and result["replace_with"]
     print(f"  {py}: {'SAFE' if has_safe else 'UNSAFE'}")
 
 print("\n=== CHECK 8: Hardcoded path in audit_arabic_gaps.py ===")
-with open("audit_arabic_gaps.py", "r", encoding="utf-8") as f:
-    ag = f.read()
-if r"C:\Users" in ag:
+if py_scans["audit_arabic_gaps.py"]["hardcoded_path"]:
     print("  STILL hardcoded")
 else:
     print("  Fixed (uses __file__)")
@@ -89,12 +111,11 @@ else:
 print("\n=== CHECK 9: JS string translation coverage ===")
 # Check a few key files for remaining English in JS
 for fn in ["synthesis-course-ar.html", "rapid-reviews-course-ar.html", "becoming-methodologist-ar.html"]:
-    with open(fn, "r", encoding="utf-8") as f:
-        content = f.read()
+    result = scans[fn]
     # Count English "Correct!" in script blocks
-    correct_en = len(re.findall(r'"Correct!', content))
-    yes_labels = len(re.findall(r'>YES<', content))
-    no_labels = len(re.findall(r'>NO<', content))
+    correct_en = result["correct_en"]
+    yes_labels = result["yes_labels"]
+    no_labels = result["no_labels"]
     print(f"  {fn}: 'Correct!' in JS={correct_en}, YES labels={yes_labels}, NO labels={no_labels}")
 
 print("\n=== SUMMARY ===")